@@ -7,6 +7,8 @@ class Frame:
     Instances of this object are mutable.
     """
 
+    __slots__ = ('_bits', '_data', '_error')
+
     def __init__(self, bits, data=0):
         """Initialise a Frame with the supplied number of data bits.
 
@@ -197,6 +199,8 @@ class ForwardFrame(Frame):
     other number of data bits are proprietary.
     """
 
+    __slots__ = ()
+
     @property
     def is_reserved(self):
         return len(self) == 20 or len(self) == 32
@@ -218,6 +222,8 @@ class BackwardFrame(Frame):
     BackwardFrameError instead.
     """
 
+    __slots__ = ()
+
     def __init__(self, data):
         super().__init__(8, data)
 
@@ -234,6 +240,8 @@ class BackwardFrameError(BackwardFrame):
     interpreted as "more than one device responded Yes".
     """
 
+    __slots__ = ()
+
     def __init__(self, data):
         super().__init__(data)
         self._error = True
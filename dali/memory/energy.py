@@ -8,6 +8,10 @@ BANK_202 = MemoryBank(202, 0x0F, has_latch=True)
 BANK_203 = MemoryBank(203, 0x0F, has_latch=True)
 BANK_204 = MemoryBank(204, 0x0F, has_latch=True)
 
+# Scaling factors indexed by the raw (two's complement) scale byte
+_SCALING_FACTORS = tuple(
+    pow(Decimal(10), s - 0x100 if s & 0x80 else s) for s in range(0x100))
+
 
 class ScaledNumericValue(NumericValue):
     """A numeric value with scaling factor provided by the bus unit
@@ -23,9 +27,7 @@ class ScaledNumericValue(NumericValue):
 
     @classmethod
     def raw_to_value(cls, raw):
-        scaling_factor = pow(Decimal(10), int.from_bytes(
-            raw[:1], 'big', signed=True))
-        return int.from_bytes(raw[1:], 'big') * scaling_factor
+        return int.from_bytes(raw[1:], 'big') * _SCALING_FACTORS[raw[0]]
 
     @classmethod
     def check_raw(cls, raw):
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from collections import namedtuple
 from enum import Enum, auto
+from functools import lru_cache
 
 from dali import device, gear
 from dali.address import Address, DeviceAddress, DeviceShort, GearAddress, GearShort
@@ -114,8 +115,10 @@ class MemoryBank:
         """Declares a memory bank at a given address
         """
         self.__address = address
-        self.locations = {x: None for x in range(0xff)}
+        self.locations = {}
         self.values = []
+        # Highest address used by any memory value in this bank
+        self._last_location = 0x00
 
         # add value for last addressable location
         class LastAddress(NumericValue):
@@ -151,13 +154,14 @@ class MemoryBank:
     def _add_memory_value(self, memory_value):
         self.values.append(memory_value)
         for location in memory_value.locations:
-            if self.locations[location.address]:
+            if location.address in self.locations:
                 raise MemoryLocationOverlap(
                     f'Overlapping MemoryLocation at address {location.address}')
             if location.type_ == MemoryType.NVM_RW_L and not self.has_lock:
                 raise LockingNotSupported()
             self.locations[location.address] = self.MemoryBankEntry(
                 location, memory_value)
+            self._last_location = max(self._last_location, location.address)
 
     def last_address(self, addr):
         """Sequence that returns the last available address in this bank
@@ -179,15 +183,20 @@ class MemoryBank:
             raise TypeError(f"Invalid addr: {addr}, expected GearShort or DeviceShort")
         last_address = yield from self.LastAddress.read(addr)
         # Reading the last address also sets DTR1 appropriately
+        # Bank 0 has a useful value at address 0x02; all other banks
+        # use this for the lock/latch byte
+        start_address = 0x02 if self.address == 0 else 0x03
+        # There is no point reading locations that no memory value
+        # uses, for example if the bus unit reports a bogus last address
+        last_address = min(last_address, self._last_location)
+        if last_address < start_address:
+            return {}
         dtr0 = 1
         if use_latch and self.has_latch:
             yield _EnableWriteMemory(addr)
             yield _DTR0(addr, 2)
             yield _WriteMemoryLocationNoReply(addr, 0xAA)
             dtr0 = 3
-        # Bank 0 has a useful value at address 0x02; all other banks
-        # use this for the lock/latch byte
-        start_address = 0x02 if self.address == 0 else 0x03
         if dtr0 != start_address:
             yield _DTR0(addr, start_address)
         raw_data = [None] * start_address
@@ -207,6 +216,9 @@ class MemoryBank:
             yield _WriteMemoryLocationNoReply(addr, 0xFF)
         result = {}
         for memory_value in self.values:
+            if memory_value._last_location > last_address:
+                # Not addressable on this bus unit
+                continue
             try:
                 r = memory_value.from_list(raw_data)
             except MemoryLocationNotImplemented:
@@ -252,7 +264,7 @@ class MemoryBank:
         """Return factory default contents for known memory locations
         """
         for address in range(0xff):
-            loc = self.locations[address]
+            loc = self.locations.get(address)
             yield loc.memory_location.default if loc else None
 
     def __repr__(self):
@@ -271,6 +283,8 @@ class MemoryBank:
 # Python 3.7
 
 class MemoryLocation:
+    __slots__ = ('__address', '__type_', '__default', '__reset')
+
     def __init__(self, address, default=None, reset=None, type_=None):
         self.__address = address
         self.__type_ = type_
@@ -300,7 +314,14 @@ class MemoryLocation:
             f'type_={self.type_})'
 
 
+@lru_cache(maxsize=None)
 def MemoryRange(start, end, **kwargs):
+    """Returns a tuple of MemoryLocations from start to end inclusive
+
+    MemoryLocation is immutable, so identical ranges (for example the
+    same value in several memory banks with the same layout) share
+    the same tuple.
+    """
     return tuple(
         MemoryLocation(address, **kwargs) for address in range(start, end + 1)
     )
@@ -322,6 +343,33 @@ class _RegisterMemoryValue(type):
                 cls.locations = (cls.locations, )
             cls.bank._add_memory_value(cls)
 
+            # Whether the value is protected by the memory bank lock byte
+            cls._lockable = cls.locations[0].type_ is MemoryType.NVM_RW_L
+
+            # Whether the value can be written, and whether the memory
+            # bank must be unlocked to do so
+            cls._writeable = all(loc.type_ in (
+                MemoryType.RAM_RW,
+                MemoryType.NVM_RW,
+                MemoryType.NVM_RW_L,
+                MemoryType.NVM_RW_P,
+            ) for loc in cls.locations)
+            cls._unlock_required = any(
+                loc.type_ is MemoryType.NVM_RW_L for loc in cls.locations)
+
+            # Highest address used by the value
+            cls._last_location = max(loc.address for loc in cls.locations)
+
+            # Pair each location with whether DTR0 must be set before
+            # it is read; otherwise DTR0 has already been incremented
+            # to the right address by the previous read
+            read_plan = []
+            dtr0 = None
+            for location in cls.locations:
+                read_plan.append((location, location.address != dtr0))
+                dtr0 = min(location.address + 1, 255)
+            cls._read_plan = tuple(read_plan)
+
             # Some types of value may need to adjust the number of
             # bytes for 'mas' or 'tmask'
             num_loc = len(cls.locations) + getattr(cls, 'mask_length_adjust', 0)
@@ -430,18 +478,14 @@ class MemoryValue(metaclass=_RegisterMemoryValue):
             addr = GearShort(addr)
         elif not isinstance(addr, (GearShort, DeviceShort)):
             raise TypeError(f"Invalid addr: {addr}, expected GearShort or DeviceShort")
-        result = []
-        dtr0 = None
+        result = bytearray()
         yield _DTR1(addr, cls.bank.address)
-        for location in cls.locations:
+        for location, set_dtr0 in cls._read_plan:
             # select correct memory location
-            if location.address != dtr0:
-                dtr0 = location.address
+            if set_dtr0:
                 yield _DTR0(addr, location.address)
             # read back value of the memory location
             r = yield _ReadMemoryLocation(addr)
-            # increase DTR0 to reflect the internal state of the driver
-            dtr0 = min(dtr0 + 1, 255)
             if r.raw_value is None:
                 raise MemoryLocationNotImplemented(
                     f'Bus unit at address "{str(addr)}" does not implement '
@@ -469,7 +513,7 @@ class MemoryValue(metaclass=_RegisterMemoryValue):
     def from_list(cls, list_):
         """Extracts the value from a list containing all values of the memory bank.
         """
-        raw = []
+        raw = bytearray()
         for location in cls.locations:
             try:
                 r = list_[location.address]
@@ -522,21 +566,11 @@ class MemoryValue(metaclass=_RegisterMemoryValue):
         else:
             if len(raw) != len(cls.locations):
                 raise ValueError("Incorrect raw data length")
-        unlock_required = force_unlock
-        # Check that all locations are writeable
-        for location in cls.locations:
-            if location.type_ not in (
-                MemoryType.RAM_RW,
-                MemoryType.NVM_RW,
-                MemoryType.NVM_RW_L,
-                MemoryType.NVM_RW_P,
-            ):
-                raise MemoryValueNotWriteable(f"{str(cls)} is not a writeable MemoryValue")
-            # Memory of type NVM_RW_P may be write (or read!)
-            # protected, but there is no standard way of unprotecting
-            # it.
-            if location.type_ == MemoryType.NVM_RW_L:
-                unlock_required = True
+        if not cls._writeable:
+            raise MemoryValueNotWriteable(f"{str(cls)} is not a writeable MemoryValue")
+        # Memory of type NVM_RW_P may be write (or read!) protected,
+        # but there is no standard way of unprotecting it.
+        unlock_required = force_unlock or cls._unlock_required
 
         dtr0 = None
         yield _DTR1(addr, cls.bank.address)
@@ -606,18 +640,17 @@ class MemoryValue(metaclass=_RegisterMemoryValue):
         Queries the value of the last addressable memory location for
         this memory bank
         """
-        last_location = max(loc.address for loc in cls.locations)
         try:
             last_address = yield from cls.bank.last_address(addr)
         except MemoryLocationNotImplemented:
             return False
-        return last_address >= last_location
+        return last_address >= cls._last_location
 
     @classmethod
     def is_locked(cls, addr):
         """Checks whether this value is locked
         """
-        if cls.locations[0].type_ == MemoryType.NVM_RW_L:
+        if cls._lockable:
             locked = yield from cls.bank.is_locked(addr)
             return locked
         else:
@@ -677,7 +710,7 @@ class StringValue(MemoryValue):
     @classmethod
     def raw_to_value(cls, raw):
         try:
-            return raw.split(b'\x00')[0].decode('ascii')
+            return raw.split(b'\x00', 1)[0].decode('ascii')
         except UnicodeDecodeError:
             return FlagValue.Invalid
 
@@ -699,10 +732,7 @@ class StringValue(MemoryValue):
 class BinaryValue(MemoryValue):
     @classmethod
     def raw_to_value(cls, raw):
-        if raw[0] == 1:
-            return True
-        else:
-            return False
+        return raw[0] == 1
 
     @classmethod
     def is_valid(cls, raw):
@@ -76,7 +76,6 @@ class RatedMedianUsefulLightSourceStarts(FixedScaleNumericValue):
 
     TMASK and MASK are supported
     """
-    "RatedMedianUsefulLightSourceStarts",
     bank = BANK_207
     scaling_factor = 100
     locations = MemoryRange(start=0x06, end=0x07, default=0xff,
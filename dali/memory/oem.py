@@ -159,16 +159,17 @@ class CCT(NumericValue):
                             type_=MemoryType.NVM_RW_L)
     mask_supported = True
     max_value = 17000
+    part209_implemented = b'\xff\xfe'
 
     @classmethod
     def raw_to_value(cls, raw):
-        if raw == bytes([0xff, 0xfe]):
+        if raw == cls.part209_implemented:
             return "Part 209 implemented"
         return super().raw_to_value(raw)
 
     @classmethod
     def is_valid(cls, raw):
-        if raw == bytes([0xff, 0xfe]):
+        if raw == cls.part209_implemented:
             return True
         return super().is_valid(raw)
 
@@ -188,24 +189,15 @@ class LightDistributionType(MemoryValue):
     locations = MemoryLocation(address=0x23, default=0xff,
                                type_=MemoryType.NVM_RW_L)
     mask_supported = True
+    _types = (
+        'not specified', 'Type I', 'Type II', 'Type III', 'Type IV', 'Type V')
 
     @classmethod
     def raw_to_value(cls, r):
         light_distribution_type = r[0]
-        if light_distribution_type == 0:
-            return 'not specified'
-        elif light_distribution_type == 1:
-            return 'Type I'
-        elif light_distribution_type == 2:
-            return 'Type II'
-        elif light_distribution_type == 3:
-            return 'Type III'
-        elif light_distribution_type == 4:
-            return 'Type IV'
-        elif light_distribution_type == 5:
-            return 'Type V'
-        else:
-            return 'reserved'
+        if light_distribution_type < len(cls._types):
+            return cls._types[light_distribution_type]
+        return 'reserved'
 
 
 class LuminaireColor(StringValue):
@@ -18,6 +18,8 @@
 # Sequences may raise exceptions, which the driver should pass to the
 # caller.
 
+from collections import deque
+
 from dali.exceptions import DALISequenceError, ProgramShortAddressFailure
 
 from dali.gear.general import *
@@ -30,6 +32,8 @@ class sleep:
     Yielded during a sequence to request that the caller wait for at
     least the specified length of time in seconds
     """
+    __slots__ = ('delay',)
+
     def __init__(self, delay):
         self.delay = delay
 
@@ -42,6 +46,8 @@ class progress:
     both.  The amount of progress is just an indication and there is
     no guarantee that it will not decrease as well as increase.
     """
+    __slots__ = ('message', 'completed', 'size')
+
     def __init__(self, message=None, completed=None, size=None):
         self.message = message
         self.completed = completed
@@ -58,38 +64,49 @@ def QueryDeviceTypes(addr):
     """Obtain a list of part 2xx device types supported by control gear
     """
     r = yield QueryDeviceType(addr)
-    if r.raw_value is None:
+    v = r.raw_value
+    if v is None:
         raise DALISequenceError("No response to initial query")
-    if r.raw_value.as_integer < 254:
-        return [r.raw_value.as_integer]
-    if r.raw_value.as_integer == 254:
+    n = v.as_integer
+    if n < 254:
+        # Most control gear supports a single device type
+        return [n]
+    if n == 254:
         return []
-    assert r.raw_value.as_integer == 255
+    assert n == 255
     last_seen = 0
     result = []
     while True:
         r = yield QueryNextDeviceType(addr)
-        if not r.raw_value:
+        v = r.raw_value
+        if not v:
             raise DALISequenceError(
                 "No response to QueryNextDeviceType()")
-        if r.raw_value.as_integer == 254:
+        n = v.as_integer
+        if n == 254:
             if len(result) == 0:
                 raise DALISequenceError(
                     "No device types returned by QueryNextDeviceType")
             return result
-        if r.raw_value.as_integer <= last_seen:
+        if n <= last_seen:
             # The gear is required to return device types in
             # ascending order, without repeats
             raise DALISequenceError("Device type received out of order")
-        result.append(r.raw_value.as_integer)
+        result.append(n)
 
 
-def QueryGroups(addr):
-    """Obtain the group membership of control gear.
+def _group_bits(mask):
+    """Yield the group numbers whose bits are set in a 16-bit mask
+    """
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
 
-    Returns a set of integers.
+
+def _query_group_mask(addr):
+    """Obtain the group membership of control gear as a 16-bit mask
     """
-    groups = set()
     g0 = yield QueryGroupsZeroToSeven(addr)
     if g0.raw_value is None:
         raise DALISequenceError("No response reading groups zero to seven")
@@ -100,11 +117,16 @@ def QueryGroups(addr):
         raise DALISequenceError("No response reading groups eight to fifteen")
     if g1.raw_value.error:
         raise DALISequenceError("Framing error reading groups eight to fifteen")
-    g = g1.raw_value + g0.raw_value
-    for i in range(0, 16):
-        if g[i]:
-            groups.add(i)
-    return groups
+    return g1.raw_value.as_integer << 8 | g0.raw_value.as_integer
+
+
+def QueryGroups(addr):
+    """Obtain the group membership of control gear.
+
+    Returns a set of integers.
+    """
+    mask = yield from _query_group_mask(addr)
+    return set(_group_bits(mask))
 
 
 def SetGroups(addr, groups):
@@ -112,39 +134,70 @@ def SetGroups(addr, groups):
 
     groups is a set of integers in the range 0..15
     """
+    mask = 0
+    for i in groups:
+        mask |= 1 << i
     if isinstance(addr, Short) or isinstance(addr, int):
-        existing = yield from QueryGroups(addr)
-        for i in groups - existing:
+        existing = yield from _query_group_mask(addr)
+        for i in _group_bits(mask & ~existing):
             yield AddToGroup(addr, i)
-        for i in existing - groups:
+        for i in _group_bits(existing & ~mask):
             yield RemoveFromGroup(addr, i)
     else:
         # Can't read from multiple devices: must write every group
         for i in range(0, 16):
-            if i in groups:
+            if mask & (1 << i):
                 yield AddToGroup(addr, i)
             else:
                 yield RemoveFromGroup(addr, i)
 
 
+def _set_search_addr(search_addr, previous=None):
+    """Set the search address of control gear
+
+    If the previous search address is passed, only the bytes that
+    have changed are sent.
+    """
+    for shift, cmd in ((16, SetSearchAddrH), (8, SetSearchAddrM),
+                       (0, SetSearchAddrL)):
+        value = (search_addr >> shift) & 0xff
+        if previous is None or value != (previous >> shift) & 0xff:
+            yield cmd(value)
+
+
 def _find_next(low, high):
-    yield SetSearchAddrH((high >> 16) & 0xff)
-    yield SetSearchAddrM((high >> 8) & 0xff)
-    yield SetSearchAddrL(high & 0xff)
+    """Find the lowest random address in the range low..high
 
+    Returns the address, None if there is no control gear in the
+    range, or "clash" if more than one control gear has the same
+    lowest random address. When an address is returned, it has been
+    left as the search address of the control gear.
+    """
+    yield from _set_search_addr(high)
     r = yield Compare()
-
-    if low == high:
-        if r.value is True:
-            return "clash" if r.raw_value.error else low
+    if r.value is not True:
         return
 
-    if r.value is True:
+    # Binary search, keeping the response from the most recent
+    # comparison at high. There is always control gear at or below
+    # high and never any below low, so once they meet that response
+    # came only from control gear at that address.
+    search_addr = high
+    while low < high:
         midpoint = (low + high) // 2
-        res = yield from _find_next(low, midpoint)
-        if res is not None:
-            return res
-        return (yield from _find_next(midpoint + 1, high))
+        yield from _set_search_addr(midpoint, search_addr)
+        search_addr = midpoint
+        mr = yield Compare()
+        if mr.value is True:
+            high = midpoint
+            r = mr
+        else:
+            low = midpoint + 1
+
+    if r.raw_value.error:
+        return "clash"
+    yield from _set_search_addr(low, search_addr)
+    return low
 
 
 def Commissioning(available_addresses=None, readdress=False,
@@ -175,64 +228,82 @@ def Commissioning(available_addresses=None, readdress=False,
             yield DTR0(255)
             yield SetShortAddress(Broadcast())
     else:
-        # We need to know which short addresses are already in use
-        for a in range(0, 64):
-            if a in available_addresses:
-                in_use = yield QueryControlGearPresent(Short(a))
-                if in_use.value:
-                    available_addresses.remove(a)
+        # We need to know which short addresses are already in use.
+        # If no control gear responds to a broadcast query, there is
+        # no need to query each short address individually.
+        present = yield QueryControlGearPresent(Broadcast())
+        if present.value:
+            candidates = set(available_addresses)
+            in_use = set()
+            for a in range(0, 64):
+                if a in candidates:
+                    r = yield QueryControlGearPresent(Short(a))
+                    if r.value:
+                        in_use.add(a)
+            available_addresses = [a for a in available_addresses
+                                   if a not in in_use]
         yield progress(
             message=f"Available addresses: {available_addresses}")
 
+    # Addresses are handed out from the front
+    available_addresses = deque(available_addresses)
+
+    # Terminate any initialisation state left over from an earlier
+    # sequence, so that no control gear remains withdrawn
     yield Terminate()
     yield Initialise(broadcast=True if readdress else False)
 
-    finished = False
-    # We loop here to cope with multiple devices picking the same
-    # random search address; when we discover that, we
-    # re-randomise and begin again.  Devices that have already
-    # received addresses are unaffected.
-    while not finished:
-        yield Randomise()
-        # Randomise can take up to 100ms
-        yield sleep(0.1)
-
-        low = 0
-        high = 0xffffff
-
-        while low is not None:
-            yield progress(completed=low, size=high)
-            low = yield from _find_next(low, high)
-            if low == "clash":
-                yield progress(message="Multiple ballasts picked the same "
-                               "random address; restarting")
-                break
-            if low is None:
-                finished = True
-                break
-            yield progress(
-                message=f"Ballast found at address {low:#x}")
-            if available_addresses:
-                new_addr = available_addresses.pop(0)
-                if dry_run:
-                    yield progress(
-                        message="Not programming short address "
-                        f"{new_addr} because dry_run is set")
+    try:
+        finished = False
+        # We loop here to cope with multiple devices picking the same
+        # random search address; when we discover that, we
+        # re-randomise and begin again.  Devices that have already
+        # received addresses are unaffected.
+        while not finished:
+            yield Randomise()
+            # Randomise can take up to 100ms
+            yield sleep(0.1)
+
+            low = 0
+            high = 0xffffff
+
+            while low is not None:
+                yield progress(completed=low, size=high)
+                low = yield from _find_next(low, high)
+                if low == "clash":
+                    yield progress(message="Multiple ballasts picked the same "
+                                   "random address; restarting")
+                    break
+                if low is None:
+                    finished = True
+                    break
+                yield progress(
+                    message=f"Ballast found at address {low:#x}")
+                if available_addresses:
+                    new_addr = available_addresses.popleft()
+                    if dry_run:
+                        yield progress(
+                            message="Not programming short address "
+                            f"{new_addr} because dry_run is set")
+                    else:
+                        yield progress(
+                            message=f"Programming short address {new_addr}")
+                        yield ProgramShortAddress(new_addr)
+                        r = yield VerifyShortAddress(new_addr)
+                        if r.value is not True:
+                            raise ProgramShortAddressFailure(new_addr)
                 else:
                     yield progress(
-                        message=f"Programming short address {new_addr}")
-                    yield ProgramShortAddress(new_addr)
-                    r = yield VerifyShortAddress(new_addr)
-                    if r.value is not True:
-                        raise ProgramShortAddressFailure(new_addr)
-            else:
-                yield progress(
-                    message="Device found but no short addresses left")
-            yield Withdraw()
-            if low < high:
-                low = low + 1
-            else:
-                low = None
-                finished = True
+                        message="Device found but no short addresses left")
+                yield Withdraw()
+                if low < high:
+                    low = low + 1
+                else:
+                    low = None
+                    finished = True
+    except Exception:
+        # Don't leave control gear in the initialisation state
+        yield Terminate()
+        raise
     yield Terminate()
     yield progress(message="Addressing complete")
@@ -54,9 +54,10 @@ class FakeMemoryBank:
         # implemented, or above the last accessible memory
         # location, or locked, or not writeable, the answer [...]
         # shall be NO and no memory location shall be written to."
-        location = self.bank.locations[address].memory_location
-        if not location:
+        entry = self.bank.locations.get(address)
+        if not entry:
             return  # not implemented
+        location = entry.memory_location
         if address > self.contents[0]:
             return  # above the last accessible memory location
         if location.type_ == MemoryType.NVM_RW_L \
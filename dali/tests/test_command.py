@@ -38,6 +38,15 @@ def _test_pattern():
 
 
 class TestCommands(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Decoding the test pattern is expensive; do it once and share
+        # the (frame, command) pairs between tests
+        cls.decoded = []
+        for fs, d, dt in _test_pattern():
+            f = frame.ForwardFrame(fs, d)
+            cls.decoded.append((f, command.from_frame(f, dt)))
+
     def assertHasAttr(self, obj, intendedAttr):
         testBool = hasattr(obj, intendedAttr)
 
@@ -47,9 +56,7 @@ class TestCommands(unittest.TestCase):
     def test_test_coverage(self):
         """all command classes are covered by test pattern"""
         seen = {}
-        for fs, d, dt in _test_pattern():
-            c = command.from_frame(
-                frame.ForwardFrame(fs, d), devicetype=dt)
+        for f, c in self.decoded:
             seen[c.__class__] = True
         for cls in command.Command._commands:
             if cls.__name__ == "UnknownEvent":
@@ -81,20 +88,20 @@ class TestCommands(unittest.TestCase):
 
     def test_roundtrip(self):
         """all frames survive command.from_frame()"""
-        for fs, d, dt in _test_pattern():
-            f = frame.ForwardFrame(fs, d)
-            c = command.from_frame(f, dt)
+        failures = []
+        for f, c in self.decoded:
             nf = c.frame
-            self.assertEqual(
-                f, nf, 'frame {} failed command round-trip; command {} '
-                'became {}'.format(str(f), str(c), str(nf)))
+            if f != nf:
+                failures.append((f, c, nf))
+        self.assertFalse(failures, '\n'.join(
+            'frame {} failed command round-trip; command {} '
+            'became {}'.format(str(f), str(c), str(nf))
+            for f, c, nf in failures))
 
     def test_str(self):
         """command objects can be converted to strings"""
-        for fs, d, dt in _test_pattern():
-            f = frame.ForwardFrame(fs, d)
-            self.assertIsInstance(str(command.from_frame(f, dt)),
-                                  str)
+        bad = [c for f, c in self.decoded if not isinstance(str(c), str)]
+        self.assertFalse(bad)
 
     def test_with_integer_destination(self):
         """commands accept integer destination"""
@@ -109,13 +116,11 @@ class TestCommands(unittest.TestCase):
 
     def test_response(self):
         """responses act sensibly"""
-        for fs, d, dt in _test_pattern():
-            f = frame.ForwardFrame(fs, d)
-            c = command.from_frame(f, dt)
-            if c.response:
-                self.assertRaises(TypeError, lambda: c.response('wibble'))
-                self.assertHasAttr(
-                    c.response(None), 'raw_value')
+        # Many commands share a response class; check each class once
+        responses = {c.response for f, c in self.decoded if c.response}
+        for response in responses:
+            self.assertRaises(TypeError, lambda: response('wibble'))
+            self.assertHasAttr(response(None), 'raw_value')
 
     def test_queryextendedversionnumber(self):
         """all gear types implement QueryExtendedVersionNumber"""
@@ -13,7 +13,12 @@ from dali.exceptions import (
 from dali.frame import BackwardFrame
 from dali.gear.general import DTR0, DTR1, ReadMemoryLocation
 from dali.memory import diagnostics, energy, info, maintenance, oem
-from dali.memory.location import FlagValue, MemoryBank, NumericValue
+from dali.memory.location import (
+    FlagValue,
+    MemoryBank,
+    MemoryLocation,
+    NumericValue,
+)
 from dali.tests import fakes
 
 
@@ -296,6 +301,12 @@ class TestMemoryBank(unittest.TestCase):
         self.assertEqual(MemoryBank(3, 45, has_lock=True).has_latch, False)
         self.assertEqual(MemoryBank(3, 45, has_latch=True).has_latch, True)
 
+    def test_locations(self):
+        # Only declared memory locations are present
+        self.assertEqual(list(MemoryBank(3, 45).locations), [0x00])
+        self.assertEqual(
+            sorted(MemoryBank(3, 45, has_lock=True).locations), [0x00, 0x02])
+
 
 class TestLocations(unittest.TestCase):
     def test_str_memoryvalue(self):
@@ -305,6 +316,19 @@ class TestLocations(unittest.TestCase):
         self.assertEqual(str(NumericValue),
                          "<class 'dali.memory.location.NumericValue'>")
 
+    def test_read_plan(self):
+        # DTR0 only needs to be set where the locations are not
+        # contiguous
+        test_bank = MemoryBank(3, 0x10)
+
+        class Reversed(NumericValue):
+            bank = test_bank
+            locations = (MemoryLocation(0x05), MemoryLocation(0x06),
+                         MemoryLocation(0x04))
+
+        self.assertEqual([set_dtr0 for _, set_dtr0 in Reversed._read_plan],
+                         [True, False, True])
+
 
 class TestMemory(unittest.TestCase):
     def setUp(self):
@@ -436,6 +460,29 @@ class TestMemory(unittest.TestCase):
         }
         self.assertEqual(values, expected)
 
+    def test_memorybank_read_all_bogus_last_address(self):
+        # A bus unit reporting a last address beyond the locations
+        # used by the memory bank is only read as far as necessary
+        class BogusBank207(FakeBank207):
+            initial_contents = [0xfe] + FakeBank207.initial_contents[1:]
+
+        bus = fakes.Bus([fakes.Gear(GearShort(0), memory_banks=(
+            fakes.FakeBank0, BogusBank207))])
+        reads = []
+        send = bus.send
+
+        def counting_send(cmd):
+            if isinstance(cmd, ReadMemoryLocation):
+                reads.append(cmd)
+            return send(cmd)
+
+        bus.send = counting_send
+        values = bus.run_sequence(maintenance.BANK_207.read_all(0))
+        self.assertEqual(
+            values[maintenance.RatedMedianUsefulLightSourceStarts], 500000)
+        # One read for the last address, then locations 0x03 to 0x07
+        self.assertEqual(len(reads), 6)
+
     def test_diagnostics(self):
         self._test_value(diagnostics.ControlGearDiagnosticBankVersion, 1)
         self._test_value(diagnostics.ControlGearOperatingTime, 3600)
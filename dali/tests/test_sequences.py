@@ -85,12 +85,58 @@ class TestSequences(unittest.TestCase):
                 self.assertIn(g.shortaddr, available)
         self.assertEqual(missed, 5)
 
+    def test_commissioning_empty_bus(self):
+        # With no control gear present, short addresses are not
+        # queried individually
+        bus = fakes.Bus([])
+        queries = []
+        send = bus.send
+
+        def counting_send(cmd):
+            if isinstance(cmd, sequences.QueryControlGearPresent):
+                queries.append(cmd)
+            return send(cmd)
+
+        bus.send = counting_send
+        bus.run_sequence(sequences.Commissioning())
+        self.assertEqual(len(queries), 1)
+
+    def test_commissioning_failure_terminates(self):
+        # Control gear that ignores ProgramShortAddress makes
+        # commissioning fail; it must not be left initialising
+        class StubbornGear(fakes.Gear):
+            def send(self, cmd):
+                if isinstance(cmd, sequences.ProgramShortAddress):
+                    return
+                return super().send(cmd)
+
+        gear = StubbornGear()
+        bus = fakes.Bus([gear])
+        self.assertRaises(sequences.ProgramShortAddressFailure,
+                          bus.run_sequence, sequences.Commissioning())
+        self.assertFalse(gear.initialising)
+
+    def test_set_search_addr(self):
+        # Only bytes that differ from the previous search address are sent
+        self.assertEqual(
+            [c.param for c in sequences._set_search_addr(0x123456)],
+            [0x12, 0x34, 0x56])
+        self.assertEqual(
+            [c.param for c in sequences._set_search_addr(0x123456, 0x123400)],
+            [0x56])
+        self.assertEqual(
+            list(sequences._set_search_addr(0x123456, 0x123456)), [])
+
     def test_query_groups(self):
         gear = [fakes.Gear(shortaddr=x, groups={x}) for x in range(0, 16)]
         bus = fakes.Bus(gear)
         for i in range(0, 16):
             self.assertEqual(bus.run_sequence(sequences.QueryGroups(i)), {i})
 
+    def test_group_bits(self):
+        self.assertEqual(list(sequences._group_bits(0)), [])
+        self.assertEqual(list(sequences._group_bits(0x8005)), [0, 2, 15])
+
     def test_set_groups(self):
         gear = [fakes.Gear(shortaddr=x, groups={x}) for x in range(0, 16)]
         bus = fakes.Bus(gear)